@@ -1,7 +1,9 @@
 import os
-import json
+import sys
 from typing import Dict, Any
 
+from .utils import json_loads
+
 # Constants
 WORKSPACE_CONFIG = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
@@ -9,15 +11,31 @@ WORKSPACE_CONFIG = os.path.join(
 )
 
 
+# Parsed config keyed by the file's mtime, so repeated lookups skip the JSON read
+_config_cache: Dict[str, Any] = {}
+
+
+def _load_workspace_config() -> Dict[str, Any]:
+    """Load WORKSPACE_CONFIG, reusing the parsed result while the file is unchanged"""
+    mtime_ns = os.stat(WORKSPACE_CONFIG).st_mtime_ns
+    cached = _config_cache.get(WORKSPACE_CONFIG)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(WORKSPACE_CONFIG, "rb") as f:
+        config = json_loads(f.read())
+    _config_cache[WORKSPACE_CONFIG] = (mtime_ns, config)
+    return config
+
+
 def get_workspaces() -> Dict[str, Any]:
     """Get all workspaces configuration"""
     print(f"DEBUG: Looking for workspace config at: {WORKSPACE_CONFIG}")
     try:
         if os.path.exists(WORKSPACE_CONFIG):
-            with open(WORKSPACE_CONFIG, "r") as f:
-                config = json.load(f)
-                print(f"DEBUG: Config loaded successfully: {config}")
-                return config
+            config = _load_workspace_config()
+            print(f"DEBUG: Config loaded successfully: {config}")
+            return config
         print("DEBUG: No workspace config found, returning empty config")
         return {"workspaces": {}}
     except Exception as e:
@@ -28,7 +46,8 @@ def get_workspaces() -> Dict[str, Any]:
 def get_workspace(name: str) -> Dict[str, Any]:
     """Get configuration for a specific workspace"""
     config = get_workspaces()
-    workspace = config["workspaces"].get(name, {})
+    # Copy so the cached config is not mutated
+    workspace = dict(config["workspaces"].get(name, {}))
     if workspace:
         # Ensure the path is absolute
         workspace["path"] = os.path.abspath(os.path.expanduser(workspace["path"]))
@@ -38,8 +57,28 @@ def get_workspace(name: str) -> Dict[str, Any]:
 def get_current_workspace() -> str:
     """Get the current workspace from config"""
     try:
-        with open(WORKSPACE_CONFIG, "r") as f:
-            config = json.load(f)
-            return config.get("current_workspace", None)
+        return _load_workspace_config().get("current_workspace", None)
     except Exception:
         return None
+
+
+def _yaml_loader():
+    """libyaml's C SafeLoader when PyYAML was built with it, else SafeLoader"""
+    import yaml
+
+    try:
+        return yaml.CSafeLoader
+    except AttributeError:
+        print(
+            "Warning: libyaml not available, falling back to the pure-Python "
+            "YAML loader",
+            file=sys.stderr,
+        )
+        return yaml.SafeLoader
+
+
+def _parse_config(text):
+    """Parse YAML config text"""
+    import yaml
+
+    return yaml.load(text, Loader=_yaml_loader())
@@ -1,26 +1,83 @@
+import functools
 import os
+import pickle
+import shutil
+import subprocess
 
 from .config import get_workspaces
 
 
+READ_BUFFER_SIZE = 1 << 17  # 128 KiB
+DIFF_PREFIXES = ("+", "-")
+DIFF_HEADERS = ("+++", "---")
+
+# Above this size (for both files) the system `diff` is used instead of
+# difflib; for smaller files process startup costs more than the pure-Python
+# diff. Both produce a valid unified diff of the same two files, but GNU diff
+# matches lines differently from difflib's SequenceMatcher, so hunk boundaries
+# and alignment can differ, and its ---/+++ headers include timestamps.
+NATIVE_DIFF_THRESHOLD = 256 * 1024
+
+RECENT_FILES_CACHE = os.path.join(os.path.dirname(__file__), ".recent_files")
+RECENT_FILES_LIMIT = 32
+
+
 def _cache_recent_file(file_path):
-    RECENT_FILES_CACHE = os.path.join(os.path.dirname(__file__), ".recent_files")
-    with open(RECENT_FILES_CACHE, "a") as f:
-        f.write(f"{file_path}\n")
+    """Move file_path to the front of the recent files list and persist it"""
+    recent = [file_path]
+    recent.extend(f for f in _get_recent_files() if f != file_path)
+    del recent[RECENT_FILES_LIMIT:]
+
+    tmp_path = f"{RECENT_FILES_CACHE}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(recent, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, RECENT_FILES_CACHE)
 
 
 def _get_recent_files():
-    RECENT_FILES_CACHE = os.path.join(os.path.dirname(__file__), ".recent_files")
-    if os.path.exists(RECENT_FILES_CACHE):
-        with open(RECENT_FILES_CACHE, "r") as f:
-            return [line.strip() for line in f.readlines() if line.strip()]
-    return []
+    """Recently opened files, most recent first"""
+    try:
+        with open(RECENT_FILES_CACHE, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+
+    # Pickles written with protocol 2+ start with the PROTO opcode; anything
+    # else is an older plain-text cache, one path per line, oldest first
+    if data[:1] != b"\x80":
+        text = data.decode(errors="surrogateescape")
+        lines = [line.strip() for line in text.splitlines()]
+        return list(dict.fromkeys(reversed([line for line in lines if line])))
+
+    try:
+        recent = pickle.loads(data)
+    except Exception:
+        return []
+    return recent if isinstance(recent, list) else []
+
+
+def _structure_signature(root_path):
+    """Cheap change marker: newest mtime among root and its top-level entries"""
+    newest = 0
+    try:
+        newest = os.stat(root_path).st_mtime_ns
+        with os.scandir(root_path) as it:
+            for entry in it:
+                try:
+                    mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+                except OSError:
+                    continue
+                newest = max(newest, mtime_ns)
+    except OSError:
+        pass
+    return newest
 
 
 def get_codebase_structure(root_path, use_cache=True):
     """Generate a compact tree representation of the codebase structure with caching"""
     # Generate a cache key based on the root path and modification time
-    cache_key = f"structure_{os.path.basename(root_path)}"
+    signature = _structure_signature(root_path)
+    cache_key = f"structure_{os.path.basename(root_path)}_{signature}"
     cache_file = os.path.join(os.path.dirname(__file__), ".structure_cache")
 
     if use_cache:
@@ -28,7 +85,7 @@ def get_codebase_structure(root_path, use_cache=True):
         if os.path.exists(cache_file):
             with open(cache_file, "r") as f:
                 cached_data = f.read()
-                if cached_data.startswith(cache_key):
+                if cached_data.startswith(f"{cache_key}:"):
                     return cached_data[len(cache_key) + 1 :]
 
     # Generate fresh structure if no cache or cache is invalid
@@ -52,7 +109,7 @@ def get_codebase_structure(root_path, use_cache=True):
                 is_last = i == len(contents) - 1
                 new_prefix = prefix + ("└── " if is_last else "├── ")
                 output += build_tree(os.path.join(path, item), new_prefix)
-        except PermissionError:
+        except OSError:
             pass
         return output
 
@@ -63,3 +120,69 @@ def get_codebase_structure(root_path, use_cache=True):
         f.write(f"{cache_key}:{structure}")
 
     return structure
+
+
+def _write_diff_lines(lines, out, diff_only):
+    """Write diff lines to out, keeping only changed lines if diff_only"""
+    any_lines = False
+    for line in lines:
+        any_lines = True
+        # Show only changed lines, without the ---/+++ file headers
+        if diff_only and (
+            not line.startswith(DIFF_PREFIXES) or line.startswith(DIFF_HEADERS)
+        ):
+            continue
+        out.write(line)
+        # The last line of a file without a trailing newline has none either
+        if not line.endswith("\n"):
+            out.write("\n")
+    return any_lines
+
+
+@functools.cache
+def _diff_bin():
+    """Path of the system diff tool, resolved on first use"""
+    return shutil.which("diff")
+
+
+def write_unified_diff(file_a, file_b, size_a, size_b, out, diff_only=False):
+    """Write a unified diff of two files to out and return whether they differ.
+
+    Large files go through the system diff tool, which raises
+    subprocess.CalledProcessError if it fails.
+    """
+    if (
+        size_a > NATIVE_DIFF_THRESHOLD
+        and size_b > NATIVE_DIFF_THRESHOLD
+        and _diff_bin() is not None
+    ):
+        # -a compares everything as text, as difflib does
+        with subprocess.Popen(
+            [_diff_bin(), "-a", "-u", file_a, file_b],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=READ_BUFFER_SIZE,
+        ) as proc:
+            _write_diff_lines(proc.stdout, out, diff_only)
+            stderr = proc.stderr.read()
+        # diff exits with 0 for identical files, 1 if they differ, 2 on
+        # trouble; anything else (e.g. negative when killed) is a failure too
+        if proc.returncode not in (0, 1):
+            raise subprocess.CalledProcessError(
+                proc.returncode, proc.args, stderr=stderr
+            )
+        return proc.returncode == 1
+
+    import difflib
+
+    # SequenceMatcher needs random access, so both sides are read in full;
+    # the diff itself is written out as it is produced.
+    with open(file_a, "r", buffering=READ_BUFFER_SIZE) as fa, open(
+        file_b, "r", buffering=READ_BUFFER_SIZE
+    ) as fb:
+        lines_a = fa.readlines()
+        lines_b = fb.readlines()
+
+    diff = difflib.unified_diff(lines_a, lines_b, fromfile=file_a, tofile=file_b)
+    return _write_diff_lines(diff, out, diff_only)
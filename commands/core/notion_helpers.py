@@ -0,0 +1,50 @@
+import os
+import pickle
+import time
+
+TASKS_CACHE = os.path.join(os.path.dirname(__file__), ".tasks_cache")
+TASKS_CACHE_TTL = 60  # seconds
+
+
+def _load_tasks_cache():
+    """Cached task lists keyed by database ID, or {} if unreadable"""
+    try:
+        with open(TASKS_CACHE, "rb") as f:
+            cache = pickle.load(f)
+    except Exception:
+        # Missing, truncated or corrupt: start over rather than fail
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _cached_list_tasks(database_id, use_cache=True):
+    """list_tasks with a short-lived on-disk cache keyed by database ID"""
+    from integrations.notion import list_tasks
+
+    key = database_id or "__default__"
+    cache = _load_tasks_cache()
+
+    entry = cache.get(key)
+    if use_cache and entry and time.time() - entry[0] < TASKS_CACHE_TTL:
+        return entry[1]
+
+    tasks = list_tasks(database_id)
+    # list_tasks returns [] on failure, so empty results are not cached
+    if tasks:
+        now = time.time()
+        cache = {k: v for k, v in cache.items() if now - v[0] < TASKS_CACHE_TTL}
+        cache[key] = (now, tasks)
+        tmp_path = f"{TASKS_CACHE}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, TASKS_CACHE)
+    return tasks
+
+
+def _parse_status_filter(status):
+    """Lowercased set of statuses from a comma-separated --status, or None"""
+    if not status:
+        return None
+    allowed = {s.strip().lower() for s in status.split(",")}
+    allowed.discard("")
+    return allowed or None
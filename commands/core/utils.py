@@ -1,33 +1,54 @@
+import functools
+import json
 import os
+import shutil
 import subprocess
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj):
+    """Serialize to 2-space indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        # YAML allows non-string keys, which orjson rejects by default
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(obj, indent=2)
+
+
+@functools.cache
+def _editor_command():
+    """Command prefix for opening files, resolved on first use"""
+    # Try Cursor first, then fall back to VSCode
+    cursor_bin = shutil.which("cursor")
+    if cursor_bin:
+        return (cursor_bin, "--goto")
+    code_bin = shutil.which("code")
+    if code_bin:
+        return (code_bin, "--reuse-window", "--goto")
+    return None
+
 
 def open_in_editor(file_path):
     """Open file in current editor (Cursor or VSCode)"""
-    abs_path = os.path.abspath(file_path)
-
-    # Try Cursor first
-    try:
-        subprocess.run(
-            ["cursor", "--version"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        subprocess.run(["cursor", "--goto", abs_path])
-        return
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-
-    # Fallback to VSCode
-    try:
-        subprocess.run(
-            ["code", "--version"],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        subprocess.run(["code", "--reuse-window", "--goto", abs_path])
-        return
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    command = _editor_command()
+    if command is None:
         print("Error: Neither Cursor nor VSCode found in PATH")
+        return
+
+    subprocess.Popen(
+        [*command, os.path.abspath(file_path)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
@@ -1,26 +1,38 @@
-import difflib
+import heapq
 import os
-import json
+import re
+import stat
+import subprocess
 import typer
-import yaml
 import sys
 from typing import Optional
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(project_root)
+if project_root not in sys.path:
+    sys.path.append(project_root)
 
 # Now you can import modules
-from core.config import get_current_workspace, get_workspaces  # noqa: E402
+from core.config import (  # noqa: E402
+    _parse_config,
+    get_current_workspace,
+    get_workspaces,
+)
 from core.file_operations import (  # noqa: E402
     _cache_recent_file,
     _get_recent_files,
     get_codebase_structure,
+    write_unified_diff,
 )
 from core.framework_helpers import get_framework_specific_prompt  # noqa: E402
-from core.utils import open_in_editor  # noqa: E402
-from modules.deepseek import json_prompt  # noqa: E402
-from integrations.notion import list_tasks  # noqa: E402
+from core.notion_helpers import (  # noqa: E402
+    _cached_list_tasks,
+    _parse_status_filter,
+)
+from core.utils import json_dumps_pretty, open_in_editor  # noqa: E402
+
+# Heavier dependencies (yaml, difflib, the DeepSeek and Notion clients) are
+# imported inside the commands that need them to keep CLI startup fast.
 
 app = typer.Typer()
 
@@ -33,6 +45,12 @@ RECENT_FILES_CACHE = os.path.join(os.path.dirname(__file__), ".recent_files")
 
 WORKSPACE_CONFIG = os.path.join(project_root, "workspace_config.json")
 
+MAX_MATCHES = 5  # matches offered by edit_file
+# Whole word only, so e.g. "recently" is still sent to DeepSeek
+_RECENT_RE = re.compile(r"\brecent\b", re.IGNORECASE)
+
+ASSISTANT_CONFIG = "./assistant_config.yml"
+
 
 # -----------------------------------------------------
 # 1) show_config
@@ -45,18 +63,20 @@ def show_config(
     Shows the current configuration from modules/assistant_config.py.
     """
     try:
-
-        config = ""
-
-        with open("./assistant_config.yml", "r") as f:
+        with open(ASSISTANT_CONFIG, "r") as f:
             config = f.read()
 
+        # Only the verbose view needs the YAML parsed
         if verbose:
-            result = f"Verbose config:\n{json.dumps(yaml.safe_load(config), indent=2)}"
+            output = json_dumps_pretty(_parse_config(config))
+            sys.stdout.write("Verbose config:\n")
         else:
-            result = f"Config: {config}"
-        typer.echo(result)
-        return result
+            output = config
+            sys.stdout.write("Config: ")
+        sys.stdout.write(output)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return output
     except ImportError:
         result = "Error: Could not load assistant_config module"
         typer.echo(result)
@@ -79,13 +99,15 @@ def list_files(
         typer.echo(msg)
         return msg
 
-    entries = os.listdir(path)
-    if not all_files:
-        entries = [e for e in entries if not e.startswith(".")]
+    with os.scandir(path) as it:
+        entries = [e.name for e in it if all_files or e.name[:1] != "."]
 
-    result = f"Files in '{path}': {entries}"
-    typer.echo(result)
-    return result
+    typer.echo(f"Files in '{path}':")
+    if entries:
+        sys.stdout.write("\n".join(entries))
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    return entries
 
 
 # -----------------------------------------------------
@@ -102,29 +124,41 @@ def compare_files(
     """
     Compares two files, optionally showing only differences.
     """
-    if not os.path.isfile(file_a) or not os.path.isfile(file_b):
+    # One stat per file covers both the existence check and the size dispatch
+    try:
+        st_a = os.stat(file_a)
+        st_b = os.stat(file_b)
+    except OSError:
+        st_a = st_b = None
+
+    if (
+        st_a is None
+        or not stat.S_ISREG(st_a.st_mode)
+        or not stat.S_ISREG(st_b.st_mode)
+    ):
         msg = f"One or both files do not exist: {file_a}, {file_b}"
         typer.echo(msg)
         return msg
 
-    with open(file_a, "r") as fa, open(file_b, "r") as fb:
-        lines_a = fa.readlines()
-        lines_b = fb.readlines()
-
-    diff = difflib.unified_diff(lines_a, lines_b, fromfile=file_a, tofile=file_b)
+    try:
+        differs = write_unified_diff(
+            file_a, file_b, st_a.st_size, st_b.st_size, sys.stdout, diff_only
+        )
+    except subprocess.CalledProcessError as e:
+        msg = f"Error comparing files: {e.stderr.strip() or e}"
+        typer.echo(msg, err=True)
+        return msg
+    except OSError as e:
+        msg = f"Error comparing files: {e}"
+        typer.echo(msg, err=True)
+        return msg
 
-    if diff_only:
-        # Show only differences
-        differences = []
-        for line in diff:
-            if line.startswith("+") or line.startswith("-"):
-                differences.append(line)
-        result = "\n".join(differences)
+    if differs:
+        result = "Files differ."
+        sys.stdout.flush()
     else:
-        # Show entire unified diff
-        result = "".join(diff)
-
-    typer.echo(result if result.strip() else "Files are identical.")
+        result = "Files are identical."
+        typer.echo(result)
     return result
 
 
@@ -138,6 +172,8 @@ def edit_file(
 ):
     print("DEBUG: Starting edit_file command")
     try:
+        from modules.deepseek import json_prompt
+
         # Get workspace config
         print(f"DEBUG: Getting workspace config for '{workspace}'")
         # Get current workspace configuration
@@ -163,7 +199,7 @@ def edit_file(
         print(f"========== Starting edit_file with: {file_description}")
 
         # Check for recent files request
-        if "recent" in file_description.lower():
+        if _RECENT_RE.search(file_description):
             print("Handling recent files request")  # Debug print
             recent_files = _get_recent_files()
             if recent_files:
@@ -174,7 +210,7 @@ def edit_file(
                 try:
                     selected = recent_files[int(choice) - 1]
                     print(f"========== Opening file: {selected}")  # Debug print
-                    os.system(f"code --goto {selected}")
+                    open_in_editor(selected)
                     return f"========== Opened recent file: {selected}"
                 except (ValueError, IndexError):
                     return "========== Invalid selection"
@@ -192,26 +228,22 @@ def edit_file(
         response = json_prompt(prompt)
         print(f"DeepSeek response: {response}")
 
-        # Parse matches using provided confidence score
-        matches = []
-        for match in response.get("results", []):
-            matches.append(
-                {
-                    "file_path": match.get("file", ""),
-                    "confidence_score": match.get("confidence_score", 0.8),
-                    "file_type": match.get("file_type", "unknown"),
-                }
-            )
+        results = response.get("results") or []
+        if not results:
+            return "No matching files found"
 
-        # Sort by confidence
-        matches.sort(key=lambda x: x.get("confidence_score", 0), reverse=True)
+        # Parse matches using provided confidence score, kept as parallel lists
+        paths = [r.get("file", "") for r in results]
+        scores = [r.get("confidence_score", 0.8) for r in results]
+        types = [r.get("file_type", "unknown") for r in results]
 
-        if not matches:
-            return "No matching files found"
+        # Only the top matches are offered, so select them without a full sort
+        order = heapq.nlargest(MAX_MATCHES, range(len(scores)), key=scores.__getitem__)
 
         # If single high-confidence match, open directly
-        if matches[0]["confidence_score"] > 0.9:
-            file_path = os.path.join(project_root, matches[0]["file_path"])
+        best = order[0]
+        if scores[best] > 0.9:
+            file_path = os.path.join(project_root, paths[best])
             print(f"High confidence match found: {file_path}")  # Debug print
             _cache_recent_file(file_path)
             open_in_editor(file_path)
@@ -219,22 +251,22 @@ def edit_file(
 
         # Multiple matches - show options
         typer.echo("Multiple matches found:")
-        for i, match in enumerate(matches[:5]):
+        for i, idx in enumerate(order):
             typer.echo(
-                f"{i+1}. {match['file_type']} file: {match['file_path']} "
-                f"(confidence: {match['confidence_score']:.2f})"
+                f"{i+1}. {types[idx]} file: {paths[idx]} "
+                f"(confidence: {scores[idx]:.2f})"
             )
 
         choice = typer.prompt("Which file to edit? (number)")
         try:
-            selected = matches[int(choice) - 1]
-            file_path = os.path.join(project_root, selected["file_path"])
+            selected = order[int(choice) - 1]
+            file_path = os.path.join(project_root, paths[selected])
             print(f"User selected file: {file_path}")  # Debug print
             _cache_recent_file(file_path)
 
             print(f"Opening file in editor: {file_path}")
             open_in_editor(file_path)
-            return f"Opened {selected['file_type']} file: {file_path}"
+            return f"Opened {types[selected]} file: {file_path}"
         except (ValueError, IndexError):
             return "Invalid selection"
     except Exception as e:
@@ -251,64 +283,77 @@ def list_notion_tasks(
         None, "--database-id", help="Notion database ID to fetch tasks from"
     ),
     status: Optional[str] = typer.Option(
-        None, "--status", help="Filter by Resolution Details status"
+        None,
+        "--status",
+        help="Filter by Resolution Details status (comma-separated for several)",
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Fetch fresh tasks instead of the cached list"
     ),
 ):
     """Lists all tasks from your Notion database."""
     try:
-        tasks = list_tasks(database_id)
+        tasks = _cached_list_tasks(database_id, use_cache=not no_cache)
 
         if not tasks:
             typer.echo("No tasks found")
             return
 
-        # Print header if tasks exist
-        if tasks:
-            typer.echo("\n=== Notion Tasks ===\n")
+        allowed_statuses = _parse_status_filter(status)
+
+        # Collect all output and write it once at the end
+        out = ["\n=== Notion Tasks ===\n\n"]
 
         for task in tasks:
             # Filter by status if specified
-            if status and task.get("status", "").lower() != status.lower():
-                continue
-
-            # Main task title and status with color
-            task_line = f"📌 {task['title']}\n"
-            task_line += f"   └─ Status: {task.get('status', 'No status')}\n"
-
-            # Group metadata in a clean indented block
-            metadata = []
-            if task.get("severity"):
-                metadata.append(f"Severity: {task['severity']}")
-            if task.get("type"):
-                metadata.append(f"Type: {task['type']}")
-
-            # People information
-            people = []
-            if task.get("reporter"):
-                people.append(f"Reporter: {task['reporter']}")
-            if task.get("assigned_to"):
-                people.append(f"Assigned To: {task['assigned_to']}")
-
-            # Assigned to
-            if task.get("assigned_to"):
-                people.append(f"Assigned To: {task['assigned_to']}")
-
-            # Dates and URLs
-            extra = []
-            if task.get("date_reported"):
-                extra.append(f"Reported: {task['date_reported']}")
-            if task.get("url"):
-                extra.append(f"URL: {task['url']}")
-
-            # Add metadata blocks with proper indentation
-            if metadata:
-                task_line += f"   ├─ {' | '.join(metadata)}\n"
-            if people:
-                task_line += f"   ├─ {' | '.join(people)}\n"
-            if extra:
-                task_line += f"   └─ {' | '.join(extra)}"
-
-            typer.echo(f"{task_line}\n")
+            if allowed_statuses is not None:
+                task_status = task.get("status")
+                if task_status is None or task_status.lower() not in allowed_statuses:
+                    continue
+
+            # Group metadata, people, and dates/URLs into " | "-joined blocks
+            metadata = " | ".join(
+                filter(
+                    None,
+                    (
+                        task.get("severity") and f"Severity: {task['severity']}",
+                        task.get("type") and f"Type: {task['type']}",
+                    ),
+                )
+            )
+            people = " | ".join(
+                filter(
+                    None,
+                    (
+                        task.get("reporter") and f"Reporter: {task['reporter']}",
+                        task.get("assigned_to")
+                        and f"Assigned To: {task['assigned_to']}",
+                    ),
+                )
+            )
+            extra = " | ".join(
+                filter(
+                    None,
+                    (
+                        task.get("date_reported")
+                        and f"Reported: {task['date_reported']}",
+                        task.get("url") and f"URL: {task['url']}",
+                    ),
+                )
+            )
+
+            # Main task title and status, then the indented blocks
+            out.append(
+                f"📌 {task['title']}\n"
+                f"   └─ Status: {task.get('status', 'No status')}\n"
+                + (f"   ├─ {metadata}\n" if metadata else "")
+                + (f"   ├─ {people}\n" if people else "")
+                + (f"   └─ {extra}" if extra else "")
+                + "\n\n"
+            )
+
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
     except ValueError as e:
         typer.echo(f"Error: {str(e)}", err=True)
@@ -0,0 +1,179 @@
+import io
+import pickle
+import shutil
+import subprocess
+
+import pytest
+from commands.core import file_operations
+
+
+@pytest.fixture
+def recent_cache(tmp_path, monkeypatch):
+    """Point the recent files cache at a temporary file"""
+    cache = tmp_path / ".recent_files"
+    monkeypatch.setattr(file_operations, "RECENT_FILES_CACHE", str(cache))
+    return cache
+
+
+def test_get_recent_files_missing_cache(recent_cache):
+    """Test that a missing cache yields no recent files"""
+    assert file_operations._get_recent_files() == []
+
+
+def test_cache_recent_file_most_recent_first(recent_cache):
+    """Test that re-opening a file moves it to the front without duplicates"""
+    file_operations._cache_recent_file("a.py")
+    file_operations._cache_recent_file("b.py")
+    file_operations._cache_recent_file("a.py")
+
+    assert file_operations._get_recent_files() == ["a.py", "b.py"]
+    assert recent_cache.read_bytes()[:1] == b"\x80"
+
+
+def test_cache_recent_file_is_capped(recent_cache):
+    """Test that only the most recent RECENT_FILES_LIMIT files are kept"""
+    limit = file_operations.RECENT_FILES_LIMIT
+    for i in range(limit + 5):
+        file_operations._cache_recent_file(f"file_{i}.py")
+
+    recent = file_operations._get_recent_files()
+    assert len(recent) == limit
+    assert recent[0] == f"file_{limit + 4}.py"
+    assert recent[-1] == "file_5.py"
+
+
+def test_get_recent_files_legacy_text(recent_cache):
+    """Test that old text caches are read newest first, without duplicates"""
+    # A leading "c" is the pickle GLOBAL opcode, so this must not be unpickled
+    recent_cache.write_text("components/a.tsx\nb.py\n\ncomponents/a.tsx\n")
+
+    assert file_operations._get_recent_files() == ["components/a.tsx", "b.py"]
+
+
+def test_get_recent_files_legacy_non_utf8(recent_cache):
+    """Test that undecodable bytes in an old text cache do not raise"""
+    recent_cache.write_bytes(b"a.py\n\xff\xfe.py\n")
+
+    recent = file_operations._get_recent_files()
+    assert len(recent) == 2
+    assert recent[1] == "a.py"
+
+
+def test_cache_recent_file_migrates_legacy_text(recent_cache):
+    """Test that caching a file rewrites an old text cache as a pickle"""
+    recent_cache.write_text("a.py\nb.py\n")
+
+    file_operations._cache_recent_file("c.py")
+
+    assert pickle.loads(recent_cache.read_bytes()) == ["c.py", "b.py", "a.py"]
+
+
+def test_get_recent_files_corrupt_pickle(recent_cache):
+    """Test that a corrupt pickle is treated as an empty list"""
+    recent_cache.write_bytes(b"\x80\x05garbage")
+
+    assert file_operations._get_recent_files() == []
+
+
+needs_diff = pytest.mark.skipif(
+    shutil.which("diff") is None, reason="system diff not installed"
+)
+
+
+def _write_pair(tmp_path, a, b):
+    file_a = tmp_path / "a.txt"
+    file_b = tmp_path / "b.txt"
+    file_a.write_bytes(a)
+    file_b.write_bytes(b)
+    return str(file_a), str(file_b)
+
+
+def _diff(file_a, file_b, diff_only=False):
+    out = io.StringIO()
+    differs = file_operations.write_unified_diff(
+        file_a, file_b, 1, 1, out, diff_only=diff_only
+    )
+    return differs, out.getvalue()
+
+
+@pytest.fixture
+def native_diff(monkeypatch):
+    """Send every comparison through the system diff tool"""
+    monkeypatch.setattr(file_operations, "NATIVE_DIFF_THRESHOLD", 0)
+
+
+def test_unified_diff_small_files_use_difflib(tmp_path):
+    """Test that small files are diffed with difflib"""
+    file_a, file_b = _write_pair(tmp_path, b"a\nb\n", b"a\nB\n")
+
+    differs, output = _diff(file_a, file_b)
+
+    assert differs
+    # difflib headers carry no timestamps, unlike diff -u
+    assert output.startswith(f"--- {file_a}\n+++ {file_b}\n")
+    assert "-b\n+B\n" in output
+
+
+def test_unified_diff_identical_files(tmp_path):
+    """Test that identical files produce no output"""
+    file_a, file_b = _write_pair(tmp_path, b"a\nb\n", b"a\nb\n")
+
+    assert _diff(file_a, file_b) == (False, "")
+
+
+def test_unified_diff_only_without_trailing_newline(tmp_path):
+    """Test that --diff-only keeps lines apart when files lack a final newline"""
+    file_a, file_b = _write_pair(tmp_path, b"a\nb\nc", b"a\nb\nC")
+
+    assert _diff(file_a, file_b, diff_only=True) == (True, "-c\n+C\n")
+
+
+@needs_diff
+def test_unified_diff_large_files_use_system_diff(tmp_path, native_diff):
+    """Test that files above the threshold go through the system diff"""
+    file_a, file_b = _write_pair(tmp_path, b"a\nb\n", b"a\nB\n")
+
+    differs, output = _diff(file_a, file_b)
+
+    assert differs
+    assert output.startswith(f"--- {file_a}\t")
+    assert "-b\n+B\n" in output
+
+
+@needs_diff
+def test_unified_diff_system_diff_identical(tmp_path, native_diff):
+    """Test that exit status 0 from diff means identical"""
+    file_a, file_b = _write_pair(tmp_path, b"a\n", b"a\n")
+
+    assert _diff(file_a, file_b) == (False, "")
+
+
+@needs_diff
+def test_unified_diff_system_diff_binary_content(tmp_path, native_diff):
+    """Test that files with NUL bytes are compared as text"""
+    file_a, file_b = _write_pair(tmp_path, b"\0\nline1\n", b"\0\nline2\n")
+
+    assert _diff(file_a, file_b, diff_only=True) == (True, "-line1\n+line2\n")
+
+
+@needs_diff
+def test_unified_diff_system_diff_error(tmp_path, native_diff):
+    """Test that exit status 2 from diff raises instead of reporting identical"""
+    file_a, _ = _write_pair(tmp_path, b"a\n", b"a\n")
+
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        _diff(file_a, str(tmp_path / "missing.txt"))
+    assert exc_info.value.returncode == 2
+
+
+def test_unified_diff_system_diff_killed(tmp_path, monkeypatch, native_diff):
+    """Test that a diff killed by a signal raises instead of reporting identical"""
+    fake_diff = tmp_path / "diff"
+    fake_diff.write_text("#!/bin/sh\necho '-partial'\nkill -9 $$\n")
+    fake_diff.chmod(0o755)
+    monkeypatch.setattr(file_operations, "_diff_bin", lambda: str(fake_diff))
+    file_a, file_b = _write_pair(tmp_path, b"a\n", b"b\n")
+
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        _diff(file_a, file_b)
+    assert exc_info.value.returncode < 0
@@ -0,0 +1,118 @@
+import pickle
+import sys
+import time
+import types
+
+import pytest
+from commands.core import notion_helpers
+
+
+@pytest.fixture
+def fake_notion(tmp_path, monkeypatch):
+    """Cache tasks in a temporary file and record calls to list_tasks"""
+    monkeypatch.setattr(notion_helpers, "TASKS_CACHE", str(tmp_path / ".tasks_cache"))
+    calls = []
+
+    def list_tasks(database_id=None):
+        calls.append(database_id)
+        return [{"title": f"Task {len(calls)}", "status": "Open"}]
+
+    module = types.ModuleType("integrations.notion")
+    module.list_tasks = list_tasks
+    monkeypatch.setitem(sys.modules, "integrations.notion", module)
+    return calls
+
+
+def test_cached_list_tasks_hit(fake_notion):
+    """Test that a second call within the TTL is served from the cache"""
+    first = notion_helpers._cached_list_tasks("db")
+    second = notion_helpers._cached_list_tasks("db")
+
+    assert first == second
+    assert fake_notion == ["db"]
+
+
+def test_cached_list_tasks_keyed_by_database(fake_notion):
+    """Test that each database ID is cached separately"""
+    notion_helpers._cached_list_tasks("db1")
+    notion_helpers._cached_list_tasks("db2")
+    notion_helpers._cached_list_tasks(None)
+
+    assert fake_notion == ["db1", "db2", None]
+
+
+def test_cached_list_tasks_expiry(fake_notion, monkeypatch):
+    """Test that entries older than the TTL are fetched again"""
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    notion_helpers._cached_list_tasks("db")
+
+    monkeypatch.setattr(
+        time, "time", lambda: now + notion_helpers.TASKS_CACHE_TTL + 1
+    )
+    tasks = notion_helpers._cached_list_tasks("db")
+
+    assert tasks[0]["title"] == "Task 2"
+    assert fake_notion == ["db", "db"]
+
+
+def test_cached_list_tasks_no_cache(fake_notion):
+    """Test that use_cache=False (--no-cache) always fetches fresh tasks"""
+    notion_helpers._cached_list_tasks("db")
+    tasks = notion_helpers._cached_list_tasks("db", use_cache=False)
+
+    assert tasks[0]["title"] == "Task 2"
+    # The fresh result replaces the cached one
+    assert notion_helpers._cached_list_tasks("db") == tasks
+    assert fake_notion == ["db", "db"]
+
+
+def test_cached_list_tasks_prunes_expired(fake_notion, monkeypatch):
+    """Test that expired entries are dropped when the cache is rewritten"""
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    notion_helpers._cached_list_tasks("old")
+
+    monkeypatch.setattr(
+        time, "time", lambda: now + notion_helpers.TASKS_CACHE_TTL + 1
+    )
+    notion_helpers._cached_list_tasks("new")
+
+    with open(notion_helpers.TASKS_CACHE, "rb") as f:
+        assert set(pickle.load(f)) == {"new"}
+
+
+def test_cached_list_tasks_empty_not_cached(fake_notion, monkeypatch):
+    """Test that empty results, which list_tasks returns on error, are not cached"""
+    monkeypatch.setattr(
+        sys.modules["integrations.notion"], "list_tasks", lambda database_id: []
+    )
+
+    assert notion_helpers._cached_list_tasks("db") == []
+    assert notion_helpers._load_tasks_cache() == {}
+
+
+@pytest.mark.parametrize("content", [b"", b"cgarbage\n", b"\x80\x05garbage"])
+def test_cached_list_tasks_corrupt_cache(fake_notion, content):
+    """Test that an unreadable cache file is treated as empty"""
+    with open(notion_helpers.TASKS_CACHE, "wb") as f:
+        f.write(content)
+
+    assert notion_helpers._cached_list_tasks("db")[0]["title"] == "Task 1"
+    assert fake_notion == ["db"]
+
+
+@pytest.mark.parametrize(
+    "status, expected",
+    [
+        (None, None),
+        ("", None),
+        ("Open", {"open"}),
+        ("Open, In Progress,DONE", {"open", "in progress", "done"}),
+        ("open,,Open ", {"open"}),
+        (" , ", None),
+    ],
+)
+def test_parse_status_filter(status, expected):
+    """Test parsing of comma-separated --status values"""
+    assert notion_helpers._parse_status_filter(status) == expected